@@ -1,19 +1,180 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+from cachetools import TTLCache
 from flask import Flask, request, jsonify
 
 # tools
-from tools.audit import SEOTechnicalAnalyzer
+from tools.audit import SEOTechnicalAnalyzer, run_analysis
 
 app = Flask(__name__)
 
+CACHE_TTL = 300  # seconds
+MAX_BATCH_URLS = 50
+# Counted from submission, so it covers time queued behind other audits too
+ANALYSIS_TIMEOUT = 15  # seconds
+
+# Recent audits keyed by (normalized URL, head_only), stored with the cache
+# clock's time of insertion; TTLCache is not thread-safe on its own
+_CACHE = TTLCache(maxsize=1024, ttl=CACHE_TTL)
+_CACHE_LOCK = threading.Lock()
+
+# Batch audits are network-bound, so fetch them concurrently over the shared
+# connection pool
+_BATCH_POOL = ThreadPoolExecutor(max_workers=16)
+
+# Parsing is CPU-bound and would hold the GIL, so it runs in worker processes.
+# Never plain fork: forking this multi-threaded server mid-request can deadlock.
+_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+_PARSE_POOL_LOCK = threading.Lock()
+
+
+def _new_parse_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=os.cpu_count(),
+        mp_context=multiprocessing.get_context(_START_METHOD),
+    )
+
+
+_PARSE_POOL = _new_parse_pool()
+
+
+# A pool whose worker died stays broken for good, so swap in a fresh one
+def _replace_parse_pool(broken: ProcessPoolExecutor):
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        # Another request may already have replaced it
+        if _PARSE_POOL is broken:
+            _PARSE_POOL = _new_parse_pool()
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    # Scheme and host are case-insensitive, but userinfo is not
+    userinfo, at, host = parts.netloc.rpartition("@")
+    netloc = userinfo + at + host.lower()
+    return urlunsplit((parts.scheme.lower(), netloc, parts.path, parts.query, ""))
+
+
+def audit(url: str, head_only: bool = False) -> dict:
+    key = (url, head_only)
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+    if entry is not None:
+        return entry[1]
+
+    # Fetch here, parse in a worker; failures aren't cached as they are
+    # usually transient
+    try:
+        page = SEOTechnicalAnalyzer(url, head_only).fetch()
+    except requests.RequestException as e:
+        return {"error": f"Failed to fetch URL: {str(e)}"}
+    pool = _PARSE_POOL
+    try:
+        future = pool.submit(run_analysis, url, page, head_only)
+        results = future.result(timeout=ANALYSIS_TIMEOUT)
+    except BrokenProcessPool:
+        _replace_parse_pool(pool)
+        return {"error": "Analysis worker crashed"}
+    except TimeoutError:
+        # Only drops the job if it is still queued; one already running can't
+        # be interrupted, so cache its report whenever it does finish
+        if not future.cancel():
+            future.add_done_callback(lambda done: _cache_finished(key, done))
+        return {"error": "Timed out analyzing URL"}
+    except Exception as e:
+        # A page that breaks the parser shouldn't turn into a 500
+        return {"error": f"Analysis failed: {str(e)}"}
+
+    with _CACHE_LOCK:
+        _CACHE[key] = (_CACHE.timer(), results)
+    return results
+
+
+def _cache_finished(key: tuple, future):
+    if future.cancelled() or future.exception() is not None:
+        return
+    with _CACHE_LOCK:
+        _CACHE[key] = (_CACHE.timer(), future.result())
+
+
+# Seconds until the cached report for key expires, so clients don't keep it
+# past the point where a fresh audit would be run
+def _cache_remaining(key: tuple) -> int:
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        now = _CACHE.timer()
+    if entry is None:
+        return 0
+    return max(0, int(CACHE_TTL - (now - entry[0])))
+
 
 @app.route("/analyze", methods=["GET", "POST"])
 def analyze_website():
     url = request.args.get("url") or request.json.get("url")
     if not url:
         return jsonify({"error": "URL parameter is required"}), 400
-    analyzer = SEOTechnicalAnalyzer(url)
-    results = analyzer.analyze()
-    return jsonify(results)
+
+    try:
+        url = normalize_url(url)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid URL: {str(e)}"}), 400
+    # ?head_only=1 (or "head_only": true in the JSON body) audits just the
+    # <head> signals, skipping the body checks
+    payload = request.get_json(silent=True)
+    head_only = request.args.get("head_only", "").lower() in ("1", "true") or (
+        isinstance(payload, dict) and payload.get("head_only") is True
+    )
+    results = audit(url, head_only)
+
+    response = jsonify(results)
+    if "error" not in results:
+        etag = hashlib.blake2b(
+            # Full and head-only reports are different representations
+            f"{url} {head_only} {results['scan_date']}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        response.set_etag(etag)
+        response.cache_control.max_age = _cache_remaining((url, head_only))
+    return response.make_conditional(request)
+
+
+def _batch_entry(url: str, head_only: bool) -> dict:
+    # One bad URL shouldn't fail the whole batch
+    try:
+        url = normalize_url(url)
+    except ValueError as e:
+        return {"url": url, "error": f"Invalid URL: {str(e)}"}
+    # Error entries carry no url of their own, so tag every entry
+    return {"url": url, **audit(url, head_only)}
+
+
+@app.route("/analyze/batch", methods=["POST"])
+def analyze_batch():
+    payload = request.get_json(silent=True)
+    urls = payload.get("urls") if isinstance(payload, dict) else None
+    if not urls or not isinstance(urls, list):
+        return jsonify({"error": "urls must be a non-empty list"}), 400
+    if len(urls) > MAX_BATCH_URLS:
+        return (
+            jsonify({"error": f"At most {MAX_BATCH_URLS} urls per batch"}),
+            400,
+        )
+    if not all(isinstance(url, str) and url for url in urls):
+        return jsonify({"error": "urls must be non-empty strings"}), 400
+    head_only = payload.get("head_only") is True
+
+    results = list(_BATCH_POOL.map(lambda url: _batch_entry(url, head_only), urls))
+    return jsonify({"results": results})
 
 
 if __name__ == "__main__":
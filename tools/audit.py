@@ -1,264 +1,523 @@
+import re
+import time
 import requests
-from bs4 import BeautifulSoup
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+from lxml import etree
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+# Shared session so repeated audits reuse keep-alive connections
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+# Bodies are truncated past this; SEO signals live near the top of the page
+MAX_BODY_BYTES = 5 * 1024 * 1024
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+_HEAD_END = re.compile(rb"</head\s*>", re.IGNORECASE)
+
+# Image checks run entirely inside libxml2. number() is NaN for a missing or
+# non-numeric size, and NaN never compares greater than 1000.
+_XP_MISSING_ALT = etree.XPath("count(//img[not(@alt) or normalize-space(@alt)=''])")
+_XP_LARGE_IMG = etree.XPath(
+    "count(//img[number(@width) > 1000 or number(@height) > 1000])"
+)
+
+# Severity of each issue template, so reports can bucket findings by number
+SEVERITY_INFO = 0
+SEVERITY_LOW = 1
+SEVERITY_MEDIUM = 2
+SEVERITY_HIGH = 3
+SEVERITY_CRITICAL = 4
+
+# Issue templates, shared by every audit. Reports get their own copy since
+# they are serialized to JSON and cached; templated ones override "issue".
+_TITLE_MISSING = MappingProxyType(
+    {
+        "category": "Title Tag",
+        "issue": "Missing title tag",
+        "impact": "Critical - Title tags are crucial for SEO and user experience",
+        "severity": SEVERITY_CRITICAL,
+        "recommendation": "Add a descriptive title tag between 30-60 characters",
+    }
+)
+_TITLE_SHORT = MappingProxyType(
+    {
+        "category": "Title Tag",
+        "impact": "High - Short titles may not be descriptive enough for search engines and users",
+        "severity": SEVERITY_HIGH,
+        "recommendation": "Expand title to be between 30-60 characters",
+    }
+)
+_TITLE_LONG = MappingProxyType(
+    {
+        "category": "Title Tag",
+        "impact": "Medium - Long titles will be truncated in search results",
+        "severity": SEVERITY_MEDIUM,
+        "recommendation": "Reduce title length to be between 30-60 characters",
+    }
+)
+_DESC_MISSING = MappingProxyType(
+    {
+        "category": "Meta Description",
+        "issue": "Missing meta description",
+        "impact": "High - Meta descriptions are important for CTR in search results",
+        "severity": SEVERITY_HIGH,
+        "recommendation": "Add a compelling meta description between 70-155 characters",
+    }
+)
+_DESC_SHORT = MappingProxyType(
+    {
+        "category": "Meta Description",
+        "impact": "Medium - Short descriptions may not provide enough context",
+        "severity": SEVERITY_MEDIUM,
+        "recommendation": "Expand description to be between 70-155 characters",
+    }
+)
+_DESC_LONG = MappingProxyType(
+    {
+        "category": "Meta Description",
+        "impact": "Low - Long descriptions will be truncated in search results",
+        "severity": SEVERITY_LOW,
+        "recommendation": "Reduce description length to be between 70-155 characters",
+    }
+)
+_H1_MISSING = MappingProxyType(
+    {
+        "category": "Heading Structure",
+        "issue": "Missing H1 heading",
+        "impact": "High - H1 is a crucial signal for page topic and structure",
+        "severity": SEVERITY_HIGH,
+        "recommendation": "Add a single, descriptive H1 heading",
+    }
+)
+_H1_MULTIPLE = MappingProxyType(
+    {
+        "category": "Heading Structure",
+        "impact": "Medium - Multiple H1s can confuse page hierarchy",
+        "severity": SEVERITY_MEDIUM,
+        "recommendation": "Use only one H1 heading per page",
+    }
+)
+_HEADING_SKIPPED = MappingProxyType(
+    {
+        "category": "Heading Structure",
+        "impact": "Medium - Improper heading hierarchy affects accessibility and SEO",
+        "severity": SEVERITY_MEDIUM,
+        "recommendation": "Maintain proper heading hierarchy (H1 → H2 → H3)",
+    }
+)
+_IMG_MISSING_ALT = MappingProxyType(
+    {
+        "category": "Image Optimization",
+        "impact": "High - Alt text is crucial for accessibility and image SEO",
+        "severity": SEVERITY_HIGH,
+        "recommendation": "Add descriptive alt text to all images",
+    }
+)
+_IMG_LARGE = MappingProxyType(
+    {
+        "category": "Image Optimization",
+        "impact": "Medium - Large images can slow down page load times",
+        "severity": SEVERITY_MEDIUM,
+        "recommendation": "Optimize large images by resizing or compressing them",
+    }
+)
+_CANONICAL_MISSING = MappingProxyType(
+    {
+        "category": "Canonical Tag",
+        "issue": "Missing canonical tag",
+        "impact": "High - Canonical tags help prevent duplicate content issues",
+        "severity": SEVERITY_HIGH,
+        "recommendation": "Add a canonical tag pointing to the preferred URL",
+    }
+)
+_CANONICAL_MISMATCH = MappingProxyType(
+    {
+        "category": "Canonical Tag",
+        "impact": "Medium - May indicate content duplication or incorrect configuration",
+        "severity": SEVERITY_MEDIUM,
+        "recommendation": "Verify canonical URL is correct",
+    }
+)
+_ROBOTS_MISSING = MappingProxyType(
+    {
+        "category": "Robots Meta",
+        "issue": "Missing robots meta tag",
+        "impact": "Low - Default behavior allows indexing and following",
+        "severity": SEVERITY_LOW,
+        "recommendation": "Consider adding robots meta tag for explicit control",
+    }
+)
+_ROBOTS_NOINDEX = MappingProxyType(
+    {
+        "category": "Robots Meta",
+        "issue": "Page is set to noindex",
+        "impact": "Critical - Page will not be indexed by search engines",
+        "severity": SEVERITY_CRITICAL,
+        "recommendation": "Remove noindex if page should be indexed",
+    }
+)
+_ROBOTS_NOFOLLOW = MappingProxyType(
+    {
+        "category": "Robots Meta",
+        "issue": "Page is set to nofollow",
+        "impact": "High - Links on page won't pass authority",
+        "severity": SEVERITY_HIGH,
+        "recommendation": "Remove nofollow if links should be followed",
+    }
+)
+_SCHEMA_MISSING = MappingProxyType(
+    {
+        "category": "Structured Data",
+        "issue": "No schema.org structured data found",
+        "impact": "Medium - Structured data helps search engines understand content",
+        "severity": SEVERITY_MEDIUM,
+        "recommendation": "Add relevant schema.org markup for your content type",
+    }
+)
+_PAGE_LARGE = MappingProxyType(
+    {
+        "category": "Performance",
+        "impact": "Medium - Large pages load slower and may affect Core Web Vitals",
+        "severity": SEVERITY_MEDIUM,
+        "recommendation": "Optimize page size by minimizing HTML, CSS, and JavaScript",
+    }
+)
+_VIEWPORT_MISSING = MappingProxyType(
+    {
+        "category": "Mobile Optimization",
+        "issue": "Missing viewport meta tag",
+        "impact": "High - Page may not be mobile-friendly",
+        "severity": SEVERITY_HIGH,
+        "recommendation": "Add proper viewport meta tag for mobile devices",
+    }
+)
+_HTTPS_MISSING = MappingProxyType(
+    {
+        "category": "Security",
+        "issue": "Not using HTTPS",
+        "impact": "High - HTTPS is a ranking factor and security requirement",
+        "severity": SEVERITY_HIGH,
+        "recommendation": "Implement SSL/HTTPS on your website",
+    }
+)
+
+
+# Values of attr on the elements that have it, like an XPath .../@attr step
+def _attr_values(elements, attr: str) -> list:
+    return [el.get(attr) for el in elements if el.get(attr) is not None]
+
+
+class Page(NamedTuple):
+    body: bytes
+    encoding: Optional[str]  # charset declared by the server, if any
+    url: str  # final URL, after redirects
+    size: Optional[int]  # full body size even if truncated; None if unknown
 
 
 class SEOTechnicalAnalyzer:
-    def __init__(self, url: str):
+    headers = {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+
+    def __init__(self, url: str, head_only: bool = False):
         self.url = url
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        self.issues = []
+        # Only audit <head> signals, skipping the heading, image and
+        # structured-data checks that need the page body
+        self.head_only = head_only
+        # Issues are bucketed by severity as they are found (index = severity)
+        self._issues = [[] for _ in range(SEVERITY_CRITICAL + 1)]
         self.warnings = []
         self.info = []
 
-    def analyze(self):
+    # Fetch the raw page body, plus its charset when the server declares one
+    def fetch(self) -> Page:
+        with _SESSION.get(
+            self.url, headers=self.headers, stream=True, timeout=(3, 10)
+        ) as response:
+            response.raise_for_status()
+
+            # The headers arrive before the body, so non-HTML responses are
+            # rejected without downloading them
+            content_type = response.headers.get("Content-Type", "").lower()
+            if content_type and not content_type.startswith(HTML_CONTENT_TYPES):
+                raise requests.RequestException(
+                    f"Unsupported Content-Type: {content_type}", response=response
+                )
+            encoding = response.encoding if "charset" in content_type else None
+
+            # Stream so an oversized page can't exhaust memory
+            body = bytearray()
+            head_done = False
+            for chunk in response.iter_content(64 * 1024):
+                body.extend(chunk)
+                if self.head_only:
+                    # Back up a little in case </head> straddles two chunks
+                    start = max(0, len(body) - len(chunk) - 8)
+                    if _HEAD_END.search(body, start):
+                        head_done = True
+                        break
+                if len(body) >= MAX_BODY_BYTES:
+                    break
+
+            # Content-Length counts encoded bytes, so it is only the page size
+            # for identity-encoded responses
+            size = len(body)
+            if head_done or size >= MAX_BODY_BYTES:
+                content_length = response.headers.get("Content-Length", "")
+                if (
+                    content_length.isdigit()
+                    and "Content-Encoding" not in response.headers
+                ):
+                    size = int(content_length)
+                elif head_done:
+                    size = None
+        return Page(bytes(body), encoding, response.url, size)
+
+    def analyze(self, page: Optional[Page] = None):
+        # page lets callers hand in a page they already fetched (e.g. from an
+        # async client); otherwise it is fetched here
+        if page is None:
+            try:
+                page = self.fetch()
+            except requests.RequestException as e:
+                return {"error": f"Failed to fetch URL: {str(e)}"}
+
+        body, encoding = page.body, page.encoding
+        self.final_url = page.url
+        self._raw = body
+        self.raw_length = page.size
 
+        if self.head_only:
+            # A page's head is small, so parse just that slice
+            head_end = _HEAD_END.search(body)
+            if head_end:
+                body = body[: head_end.end()]
+
+        # Without an explicit encoding libxml2 sniffs <meta charset> itself
         try:
-            response = requests.get(self.url, headers=self.headers)
-            response.raise_for_status()
-            self.soup = BeautifulSoup(response.text, "html.parser")
+            parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
+        except LookupError:
+            parser = None
+        try:
+            self.tree = lxml.html.document_fromstring(body, parser=parser)
+        except (etree.ParserError, ValueError):
+            # libxml2 rejects some documents outright; BeautifulSoup still
+            # builds an lxml tree from them. Imported here since it is rarely
+            # needed and pulling in bs4 slows every worker's startup.
+            from lxml.html import soupparser
+
+            try:
+                self.tree = soupparser.fromstring(body)
+            except ValueError:
+                # Control characters survive BeautifulSoup but lxml refuses
+                # them; audit an empty document so everything reads as missing
+                self.tree = lxml.html.document_fromstring("<html></html>")
+
+        self._collect()
 
-            # Run all analysis methods
-            self._analyze_title()
-            self._analyze_meta_description()
+        # Run all analysis methods
+        self._analyze_title()
+        self._analyze_meta_description()
+        if not self.head_only:
             self._analyze_headings()
             self._analyze_images()
-            self._analyze_canonical()
-            self._analyze_robots()
+        self._analyze_canonical()
+        self._analyze_robots()
+        if not self.head_only:
+            # Microdata and JSON-LD often sit in the body, which isn't read
             self._analyze_schema()
-            self._analyze_performance()
-            self._analyze_mobile_friendliness()
-            self._analyze_ssl()
+        self._analyze_performance()
+        self._analyze_mobile_friendliness()
+        self._analyze_ssl()
+
+        return self._generate_report()
+
+    def _add_issue(self, issue):
+        self._issues[issue["severity"]].append(issue)
+
+    # Walk the tree once, bucketing every element the analyzers look at
+    def _collect(self):
+        self._title = None
+        self._metas_by_name = {}
+        self._links_by_rel = {}
+        self._heading_levels = bytearray()
+        self._ldjson_scripts = []
+
+        handlers = self._COLLECTORS
+        for el in self.tree.iter(*handlers):
+            handlers[el.tag](self, el)
 
-            return self._generate_report()
+    def _collect_title(self, el):
+        if self._title is None:
+            self._title = el.text_content()
 
-        except requests.RequestException as e:
-            return {"error": f"Failed to fetch URL: {str(e)}"}
+    def _collect_meta(self, el):
+        name = el.get("name")
+        if name is not None:
+            self._metas_by_name.setdefault(name, []).append(el)
+
+    def _collect_link(self, el):
+        rel = el.get("rel")
+        if rel is not None:
+            self._links_by_rel.setdefault(rel, []).append(el)
+
+    def _collect_heading(self, el):
+        self._heading_levels.append(int(el.tag[1]))
+
+    def _collect_script(self, el):
+        if el.get("type") == "application/ld+json":
+            self._ldjson_scripts.append(el)
+
+    _COLLECTORS = {
+        "title": _collect_title,
+        "meta": _collect_meta,
+        "link": _collect_link,
+        "script": _collect_script,
+        **dict.fromkeys(("h1", "h2", "h3", "h4", "h5", "h6"), _collect_heading),
+    }
 
     # Analysis page Title
     def _analyze_title(self):
-        title = self.soup.title.string if self.soup.title else None
+        title = self._title
 
         if not title:
-            self.issues.append(
-                {
-                    "category": "Title Tag",
-                    "issue": "Missing title tag",
-                    "impact": "Critical - Title tags are crucial for SEO and user experience",
-                    "recommendation": "Add a descriptive title tag between 30-60 characters",
-                }
-            )
+            self._add_issue(dict(_TITLE_MISSING))
         else:
             length = len(title)
             if length < 30:
-                self.issues.append(
+                self._add_issue(
                     {
-                        "category": "Title Tag",
+                        **_TITLE_SHORT,
                         "issue": f"Title too short ({length} characters): {title}",
-                        "impact": "High - Short titles may not be descriptive enough for search engines and users",
-                        "recommendation": "Expand title to be between 30-60 characters",
                     }
                 )
             elif length > 60:
-                self.issues.append(
+                self._add_issue(
                     {
-                        "category": "Title Tag",
+                        **_TITLE_LONG,
                         "issue": f"Title too long ({length} characters): {title}",
-                        "impact": "Medium - Long titles will be truncated in search results",
-                        "recommendation": "Reduce title length to be between 30-60 characters",
                     }
                 )
 
     # Analysis Meta Description
     def _analyze_meta_description(self):
         """Analyze meta description"""
-        meta_desc = self.soup.find("meta", {"name": "description"})
+        # A description meta without a content attribute counts as missing
+        meta_desc = _attr_values(self._metas_by_name.get("description", []), "content")
 
         if not meta_desc:
-            self.issues.append(
-                {
-                    "category": "Meta Description",
-                    "issue": "Missing meta description",
-                    "impact": "High - Meta descriptions are important for CTR in search results",
-                    "recommendation": "Add a compelling meta description between 70-155 characters",
-                }
-            )
-        elif meta_desc.get("content"):
-            length = len(meta_desc["content"])
+            self._add_issue(dict(_DESC_MISSING))
+        elif meta_desc[0]:
+            length = len(meta_desc[0])
             if length < 70:
                 self.warnings.append(
                     {
-                        "category": "Meta Description",
+                        **_DESC_SHORT,
                         "issue": f"Description too short ({length} characters)",
-                        "impact": "Medium - Short descriptions may not provide enough context",
-                        "recommendation": "Expand description to be between 70-155 characters",
                     }
                 )
             elif length > 155:
                 self.warnings.append(
                     {
-                        "category": "Meta Description",
+                        **_DESC_LONG,
                         "issue": f"Description too long ({length} characters)",
-                        "impact": "Low - Long descriptions will be truncated in search results",
-                        "recommendation": "Reduce description length to be between 70-155 characters",
                     }
                 )
 
     # Analysis Headings
     def _analyze_headings(self):
 
-        headings = []
-        for i in range(1, 7):
-            h_tags = self.soup.find_all(f"h{i}")
-            headings.extend([(f"h{i}", h.text.strip()) for h in h_tags])
+        # One byte per heading, in document order
+        levels = self._heading_levels
+        h1_count = levels.count(1)
 
-        if not any(h[0] == "h1" for h in headings):
-            self.issues.append(
-                {
-                    "category": "Heading Structure",
-                    "issue": "Missing H1 heading",
-                    "impact": "High - H1 is a crucial signal for page topic and structure",
-                    "recommendation": "Add a single, descriptive H1 heading",
-                }
-            )
+        if not h1_count:
+            self._add_issue(dict(_H1_MISSING))
 
-        h1_count = len([h for h in headings if h[0] == "h1"])
         if h1_count > 1:
             self.warnings.append(
-                {
-                    "category": "Heading Structure",
-                    "issue": f"Multiple H1 headings found ({h1_count})",
-                    "impact": "Medium - Multiple H1s can confuse page hierarchy",
-                    "recommendation": "Use only one H1 heading per page",
-                }
+                {**_H1_MULTIPLE, "issue": f"Multiple H1 headings found ({h1_count})"}
             )
 
-        prev_level = 0
-        for h_tag, text in headings:
-            current_level = int(h_tag[1])
+        for prev_level, current_level in zip(b"\0" + levels, levels):
             if current_level - prev_level > 1:
                 self.warnings.append(
                     {
-                        "category": "Heading Structure",
+                        **_HEADING_SKIPPED,
                         "issue": f"Skipped heading level (from H{prev_level} to H{current_level})",
-                        "impact": "Medium - Improper heading hierarchy affects accessibility and SEO",
-                        "recommendation": "Maintain proper heading hierarchy (H1 → H2 → H3)",
                     }
                 )
-            prev_level = current_level
 
     # Analysis Image Optimization
     def _analyze_images(self):
-        images = self.soup.find_all("img")
-        missing_alt = [
-            img.get("src", "unknown") for img in images if not img.get("alt")
-        ]
-        large_images = [
-            img["src"]
-            for img in images
-            if img.get("width")
-            and img.get("height")
-            and img["width"].isdigit()
-            and img["height"].isdigit()
-            and (int(img["width"]) > 1000 or int(img["height"]) > 1000)
-        ]
+        missing_alt = int(_XP_MISSING_ALT(self.tree))
+        large_images = int(_XP_LARGE_IMG(self.tree))
 
         if missing_alt:
-            self.issues.append(
+            self._add_issue(
                 {
-                    "category": "Image Optimization",
-                    "issue": f"Missing alt text on {len(missing_alt)} images",
-                    "impact": "High - Alt text is crucial for accessibility and image SEO",
-                    "recommendation": "Add descriptive alt text to all images",
+                    **_IMG_MISSING_ALT,
+                    "issue": f"Missing alt text on {missing_alt} images",
                 }
             )
 
         if large_images:
-            self.issues.append(
+            self._add_issue(
                 {
-                    "category": "Image Optimization",
-                    "issue": f"Found {len(large_images)} images exceeding 1000px in width or height",
-                    "impact": "Medium - Large images can slow down page load times",
-                    "recommendation": "Optimize large images by resizing or compressing them",
+                    **_IMG_LARGE,
+                    "issue": f"Found {large_images} images exceeding 1000px in width or height",
                 }
             )
 
     # Analysis Canonical Tag
     def _analyze_canonical(self):
-        canonical = self.soup.find("link", {"rel": "canonical"})
-        if canonical:
-            self.issues.append(
-                {
-                    "category": "Canonical Tag",
-                    "issue": "Missing canonical tag",
-                    "impact": "High - Canonical tags help prevent duplicate content issues",
-                    "recommendation": "Add a canonical tag pointing to the preferred URL",
-                }
-            )
-        elif canonical.get("href"):
-            canonical_url = canonical["href"]
+        # A canonical link without an href counts as missing
+        canonical = _attr_values(self._links_by_rel.get("canonical", []), "href")
+        if not canonical:
+            self._add_issue(dict(_CANONICAL_MISSING))
+        elif canonical[0]:
+            canonical_url = canonical[0]
             if canonical_url != self.url:
                 self.warnings.append(
                     {
-                        "category": "Canonical Tag",
+                        **_CANONICAL_MISMATCH,
                         "issue": f"Canonical URL ({canonical_url}) differs from current URL",
-                        "impact": "Medium - May indicate content duplication or incorrect configuration",
-                        "recommendation": "Verify canonical URL is correct",
                     }
                 )
 
     # Analysis Robots Meta Tag
     def _analyze_robots(self):
-        robots_meta = self.soup.find("meta", {"name": "robots"}) or self.soup.find(
-            "meta", {"name": "googlebot"}
+        robots_meta = _attr_values(
+            self._metas_by_name.get("robots", [])
+            + self._metas_by_name.get("googlebot", []),
+            "content",
         )
 
         if not robots_meta:
-            self.warnings.append(
-                {
-                    "category": "Robots Meta",
-                    "issue": "Missing robots meta tag",
-                    "impact": "Low - Default behavior allows indexing and following",
-                    "recommendation": "Consider adding robots meta tag for explicit control",
-                }
-            )
+            self.warnings.append(dict(_ROBOTS_MISSING))
         else:
-            content = robots_meta.get("content", "").lower()
+            content = " ".join(robots_meta).lower()
             if "noindex" in content:
-                self.issues.append(
-                    {
-                        "category": "Robots Meta",
-                        "issue": "Page is set to noindex",
-                        "impact": "Critical - Page will not be indexed by search engines",
-                        "recommendation": "Remove noindex if page should be indexed",
-                    }
-                )
+                self._add_issue(dict(_ROBOTS_NOINDEX))
             if "nofollow" in content:
-                self.warnings.append(
-                    {
-                        "category": "Robots Meta",
-                        "issue": "Page is set to nofollow",
-                        "impact": "High - Links on page won't pass authority",
-                        "recommendation": "Remove nofollow if links should be followed",
-                    }
-                )
+                self.warnings.append(dict(_ROBOTS_NOFOLLOW))
 
     # Analysis Schema.org Structured Data
     def _analyze_schema(self):
-        schema_scripts = self.soup.find_all("script", {"type": "application/ld+json"})
-        schema_found = "schema.org" in str(self.soup)
+        schema_scripts = self._ldjson_scripts
+        schema_found = b"schema.org" in self._raw
 
         if not schema_found and not schema_scripts:
-            self.warnings.append(
-                {
-                    "category": "Structured Data",
-                    "issue": "No schema.org structured data found",
-                    "impact": "Medium - Structured data helps search engines understand content",
-                    "recommendation": "Add relevant schema.org markup for your content type",
-                }
-            )
+            self.warnings.append(dict(_SCHEMA_MISSING))
         else:
             self.info.append(
                 {
@@ -269,56 +528,38 @@ class SEOTechnicalAnalyzer:
 
     # Analysis Page Performance
     def _analyze_performance(self):
-        page_size = len(str(self.soup))
-        if page_size > 100000:  # 100KB
+        page_size = self.raw_length
+        if page_size is not None and page_size > 100000:  # 100KB
             self.warnings.append(
-                {
-                    "category": "Performance",
-                    "issue": f"Large page size ({page_size/1000:.1f}KB)",
-                    "impact": "Medium - Large pages load slower and may affect Core Web Vitals",
-                    "recommendation": "Optimize page size by minimizing HTML, CSS, and JavaScript",
-                }
+                {**_PAGE_LARGE, "issue": f"Large page size ({page_size/1000:.1f}KB)"}
             )
 
     # Check basic mobile-friendliness indicators
     def _analyze_mobile_friendliness(self):
-        viewport = self.soup.find("meta", {"name": "viewport"})
-        if not viewport:
-            self.issues.append(
-                {
-                    "category": "Mobile Optimization",
-                    "issue": "Missing viewport meta tag",
-                    "impact": "High - Page may not be mobile-friendly",
-                    "recommendation": "Add proper viewport meta tag for mobile devices",
-                }
-            )
+        if "viewport" not in self._metas_by_name:
+            self._add_issue(dict(_VIEWPORT_MISSING))
 
     # Check SSL/HTTPS implementation
     def _analyze_ssl(self):
-        if not self.url.startswith("https"):
-            self.issues.append(
-                {
-                    "category": "Security",
-                    "issue": "Not using HTTPS",
-                    "impact": "High - HTTPS is a ranking factor and security requirement",
-                    "recommendation": "Implement SSL/HTTPS on your website",
-                }
-            )
+        # Judge where the page is actually served from, after redirects
+        if not self.final_url.startswith("https"):
+            self._add_issue(dict(_HTTPS_MISSING))
 
-    # Generate final report 
+    # Generate final report
     def _generate_report(self):
         return {
             "report": f"SEO Technical Analysis Report for {self.url} ",
             "url": self.url,
-            "scan_date": datetime.now().isoformat(),
-            "critical_issues": [
-                issue for issue in self.issues if "Critical" in issue.get("impact", "")
-            ],
-            "high_impact_issues": [
-                issue for issue in self.issues if "High" in issue.get("impact", "")
-            ],
+            "scan_date": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "critical_issues": self._issues[SEVERITY_CRITICAL],
+            "high_impact_issues": self._issues[SEVERITY_HIGH],
             "warnings": self.warnings,
             "info": self.info,
-            "total_issues": len(self.issues),
+            "total_issues": sum(len(bucket) for bucket in self._issues),
             "total_warnings": len(self.warnings),
         }
+
+
+# Analyze an already-fetched page; module-level so worker processes can run it
+def run_analysis(url: str, page: Page, head_only: bool = False) -> dict:
+    return SEOTechnicalAnalyzer(url, head_only).analyze(page)